@@ -47,10 +47,6 @@ class ControlPanel(QWidget):
         self.zoom_spinbox.setSuffix("%")
         self.zoom_spinbox.valueChanged.connect(self.on_zoom_spinbox_changed)
         
-        # Connect slider and spinbox to keep them in sync
-        self.zoom_slider.valueChanged.connect(self.zoom_spinbox.setValue)
-        self.zoom_spinbox.valueChanged.connect(self.zoom_slider.setValue)
-        
         # Add zoom controls to layout
         zoom_layout.addWidget(QLabel("Zoom:"), 0, 0)
         zoom_layout.addWidget(self.zoom_slider, 0, 1)
@@ -72,24 +68,36 @@ class ControlPanel(QWidget):
         
     def on_zoom_slider_changed(self, value):
         """Handle zoom slider changes"""
+        # Keep the spinbox in sync without it emitting zoom_changed a second time
+        self.zoom_spinbox.blockSignals(True)
+        self.zoom_spinbox.setValue(value)
+        self.zoom_spinbox.blockSignals(False)
+        
         zoom_level = value / 100.0
         self.zoom_changed.emit(zoom_level)
         
     def on_zoom_spinbox_changed(self, value):
         """Handle zoom spinbox changes"""
+        # Keep the slider in sync without it emitting zoom_changed a second time
+        self.zoom_slider.blockSignals(True)
+        self.zoom_slider.setValue(value)
+        self.zoom_slider.blockSignals(False)
+        
         zoom_level = value / 100.0
         self.zoom_changed.emit(zoom_level)
         
     def reset_zoom(self):
         """Reset zoom to 100%"""
-        self.zoom_slider.setValue(100)
+        self.set_zoom(1.0)
         self.zoom_changed.emit(1.0)
         
     def set_zoom(self, zoom_level):
-        """Set the zoom level (1.0 = 100%)"""
+        """Set the displayed zoom level (1.0 = 100%) without emitting zoom_changed"""
         zoom_percent = int(zoom_level * 100)
-        self.zoom_slider.setValue(zoom_percent)
-        self.zoom_spinbox.setValue(zoom_percent)
+        for control in (self.zoom_slider, self.zoom_spinbox):
+            control.blockSignals(True)
+            control.setValue(zoom_percent)
+            control.blockSignals(False)
         
     def set_image(self, pixmap):
         """Set the image for the histogram widget"""
@@ -1,14 +1,273 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QScrollBar, QComboBox, QSlider
-from PyQt6.QtGui import QPainter, QPen, QBrush, QColor, QPixmap
-from PyQt6.QtCore import Qt, QRect, pyqtSignal, QThread, QTimer, QMutex, QWaitCondition
+from PyQt6.QtGui import QPainter, QPen, QBrush, QColor, QPixmap, QImage, QIcon
+from PyQt6.QtCore import (Qt, QRect, pyqtSignal, QThread, QTimer, QMutex, QWaitCondition,
+                          QObject, QRunnable, QThreadPool)
 import numpy as np
+import os
+import sys
 import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+# Painting resources, created once instead of on every repaint
+BACKGROUND_COLOR = QColor(255, 255, 255)
+TEXT_COLOR = QColor(0, 0, 0)
+
+# Histogram bars: 50% transparency fill, 90% transparency line
+RED_BRUSH = QBrush(QColor(255, 0, 0, 128))
+RED_PEN = QPen(QColor(255, 0, 0, 26), 1)
+GREEN_BRUSH = QBrush(QColor(0, 255, 0, 128))
+GREEN_PEN = QPen(QColor(0, 255, 0, 26), 1)
+BLUE_BRUSH = QBrush(QColor(0, 0, 255, 128))
+BLUE_PEN = QPen(QColor(0, 0, 255, 26), 1)
+
+# Brushes and pens indexed by histogram row (red, green, blue)
+CHANNEL_BRUSHES = (RED_BRUSH, GREEN_BRUSH, BLUE_BRUSH)
+CHANNEL_PENS = (RED_PEN, GREEN_PEN, BLUE_PEN)
+
+# Highlight overlay
+HIGHLIGHT_LINE_PEN = QPen(QColor(0, 0, 0), 2)
+HIGHLIGHT_BRUSH = QBrush(QColor(255, 255, 0, 80))  # Yellow with 30% opacity
+OVERLAY_BRUSH = QBrush(QColor(128, 128, 128, 180))  # Gray with 70% opacity
+
+# Highlight mask computation: rows per band, sized so a band's scratch buffers stay in cache,
+# and a worker pool to spread the bands over the cores (None on single-core machines)
+MASK_BAND_ROWS = 128
+MASK_WORKERS = ThreadPoolExecutor(max_workers=os.cpu_count()) if (os.cpu_count() or 1) > 1 else None
+
+# Dense bands are brightened through byte-pair tables indexed by a uint16 view of the
+# pixels, which only lines up with their B, G, R, A bytes on little-endian machines
+LITTLE_ENDIAN = sys.byteorder == 'little'
+
+# Approximate size in pixels of the subsampled image processed while dragging
+PREVIEW_PIXELS = 1024 * 1024
+
+def glyph_icon(glyph, size=20, scale=2):
+    """Render a text glyph such as an emoji once into an icon of size x size pixels"""
+    # Swapping a prerendered icon avoids re-shaping the glyph through font fallback
+    # every time a button switches between glyphs. It is rendered at scale times
+    # the size so it stays sharp on high-DPI screens
+    pixmap = QPixmap(size * scale, size * scale)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(pixmap)
+    font = painter.font()
+    font.setPixelSize((size - 4) * scale)
+    painter.setFont(font)
+    painter.drawText(pixmap.rect(), Qt.AlignmentFlag.AlignCenter, glyph)
+    painter.end()
+    pixmap.setDevicePixelRatio(scale)
+    return QIcon(pixmap)
+
+def split_channel_planes(image_array):
+    """Copy the B, G and R channels of a BGRA array into one contiguous (3, H, W) array of planes"""
+    # The range kernels read every channel separately, and contiguous planes let them
+    # stream plain uint8 rows instead of picking one byte out of every 4-byte pixel
+    return np.ascontiguousarray(image_array[:, :, :3].transpose(2, 0, 1))
+
+def channel_range_setup(left_bin, right_bin, red_enabled, green_enabled, blue_enabled):
+    """Get the enabled channel plane indices and the wraparound range used by the range kernels"""
+    # Note: QImage.bits() returns BGRA format, so the planes are [Blue, Green, Red]
+    channels = [channel for channel, enabled in ((0, blue_enabled), (1, green_enabled), (2, red_enabled)) if enabled]
+    
+    # An inverted range, or one entirely outside 0-255, selects nothing. Dragging below
+    # the histogram gives a negative width, so right_bin can end up below left_bin
+    if right_bin < left_bin or left_bin > 255 or right_bin < 0:
+        return [], np.uint8(0), np.uint8(0)
+    left_bin = max(0, left_bin)
+    right_bin = min(255, right_bin)
+    
+    # Subtracting left_bin with uint8 wraparound sends values below the range past 255,
+    # so a single comparison tests both ends of the range
+    range_start = np.uint8(left_bin)
+    range_span = np.uint8(max(0, right_bin - left_bin))
+    return channels, range_start, range_span
+
+def fill_channel_range_band(planes_band, mask_band, channels, range_start, range_span):
+    """Set mask_band where any of the given channel planes of planes_band lies in the range"""
+    offsets = np.empty(mask_band.shape, dtype=np.uint8)
+    channel_mask = np.empty(mask_band.shape, dtype=bool)
+    mask_band[:] = False
+    for channel in channels:
+        np.subtract(planes_band[channel], range_start, out=offsets)
+        np.less_equal(offsets, range_span, out=channel_mask)
+        mask_band |= channel_mask
+        
+def map_row_bands(band_function, height):
+    """Call band_function(top) for every band of rows, spread over the cores when possible"""
+    # Working through the image in bands of rows keeps each band in cache while it is
+    # processed, and NumPy releases the GIL so the bands can run in parallel
+    band_tops = range(0, height, MASK_BAND_ROWS)
+    if MASK_WORKERS is not None and height > MASK_BAND_ROWS:
+        return list(MASK_WORKERS.map(band_function, band_tops))
+    return [band_function(top) for top in band_tops]
+
+def channel_range_mask(channel_planes, left_bin, right_bin, red_enabled, green_enabled, blue_enabled):
+    """Mask the pixels where any enabled channel of the B, G, R planes lies in [left_bin, right_bin]"""
+    height, width = channel_planes.shape[1:]
+    mask = np.zeros((height, width), dtype=bool)
+    
+    channels, range_start, range_span = channel_range_setup(left_bin, right_bin, red_enabled, green_enabled, blue_enabled)
+    if not channels:
+        return mask
+        
+    def fill_band(top):
+        fill_channel_range_band(
+            channel_planes[:, top:top + MASK_BAND_ROWS], mask[top:top + MASK_BAND_ROWS],
+            channels, range_start, range_span
+        )
+        
+    map_row_bands(fill_band, height)
+    return mask
+
+def channel_range_count(channel_planes, left_bin, right_bin, red_enabled, green_enabled, blue_enabled):
+    """Count the pixels channel_range_mask would select, without building the full mask"""
+    height, width = channel_planes.shape[1:]
+    
+    channels, range_start, range_span = channel_range_setup(left_bin, right_bin, red_enabled, green_enabled, blue_enabled)
+    if not channels:
+        return 0
+        
+    def count_band(top):
+        planes_band = channel_planes[:, top:top + MASK_BAND_ROWS]
+        mask_band = np.empty(planes_band.shape[1:], dtype=bool)
+        fill_channel_range_band(planes_band, mask_band, channels, range_start, range_span)
+        return int(np.count_nonzero(mask_band))
+        
+    return sum(map_row_bands(count_band, height))
+
+def cumulative_value_counts(plane):
+    """Get the running totals of the values of a uint8 plane, with a leading zero"""
+    # The number of values in [left, right] is then totals[right + 1] - totals[left]
+    totals = np.zeros(257, dtype=np.int64)
+    np.cumsum(np.bincount(plane.ravel(), minlength=256), out=totals[1:])
+    return totals
+
+def cumulative_range_count(totals, left_bin, right_bin):
+    """Count the values in [left_bin, right_bin] from the running totals of cumulative_value_counts"""
+    # Clamped like channel_range_setup, so an inverted or out-of-range selection counts 0
+    left_bin = max(0, left_bin)
+    right_bin = min(255, right_bin)
+    if right_bin < left_bin:
+        return 0
+    return int(totals[right_bin + 1] - totals[left_bin])
+
+def brightness_lookup(brightness_level):
+    """Get the 256-entry table of brightened values for every 8-bit input value"""
+    # brightness_level is 0.0 to 1.0, representing 0% to 100% of max brightness.
+    # The result only depends on the 8-bit input value, so it is computed once per value
+    # with the same arithmetic and then looked up, instead of in floating point per pixel
+    values = np.arange(256, dtype=np.uint8)
+    return np.clip(values + (255 - values) * brightness_level, 0, 255).astype(np.uint8)
+
+@lru_cache(maxsize=4)
+def brightness_pair_lookups(brightness_level):
+    """Get the 65536-entry tables that brighten the (blue, green) and (red, alpha) byte pairs of BGRA pixels"""
+    # Viewed as uint16, every BGRA pixel is two little-endian byte pairs, so two table
+    # lookups brighten a whole pixel. The alpha byte maps to itself
+    brighten = brightness_lookup(brightness_level)
+    pairs = np.arange(65536, dtype=np.uint16)
+    low = brighten[pairs & 255].astype(np.uint16)
+    high = pairs >> 8
+    blue_green = low | (brighten[high].astype(np.uint16) << 8)
+    red_alpha = low | (high << 8)
+    blue_green.setflags(write=False)
+    red_alpha.setflags(write=False)
+    return blue_green, red_alpha
+
+def brighten_dense_pixels(image_array, result_array, mask, brightness_level):
+    """Write a BGRA array into result_array with the masked pixels brightened, for masks that select most pixels"""
+    # When most pixels are selected, brightening every pixel through the pair tables and
+    # restoring the unselected ones is cheaper than gathering and scattering the selection
+    blue_green, red_alpha = brightness_pair_lookups(brightness_level)
+    image_pairs = image_array.view(np.uint16)
+    result_pairs = result_array.view(np.uint16)
+    np.take(blue_green, image_pairs[..., 0], out=result_pairs[..., 0])
+    np.take(red_alpha, image_pairs[..., 1], out=result_pairs[..., 1])
+    np.copyto(result_array.view(np.uint32)[..., 0], image_array.view(np.uint32)[..., 0], where=~mask)
+
+def brighten_masked_pixels(image_array, mask, brighten):
+    """Replace the RGB channels of the masked pixels of a contiguous BGRA array through brighten, in place"""
+    # Resolve the mask to pixel indices once, then gather and store whole 32-bit BGRA
+    # pixels instead of indexing each channel through the boolean mask
+    pixels = image_array.view(np.uint32).reshape(-1)
+    indices = np.flatnonzero(mask)
+    selected = pixels[indices].view(np.uint8).reshape(-1, 4)
+    selected[:, :3] = brighten[selected[:, :3]]
+    pixels[indices] = selected.view(np.uint32).reshape(-1)
+
+def channel_range_packed_mask(channel_planes, left_bin, right_bin, red_enabled, green_enabled, blue_enabled):
+    """Build the bit-packed channel_range_mask of the B, G, R planes and count its pixels"""
+    height, width = channel_planes.shape[1:]
+    
+    # The mask is kept packed 8 pixels per byte, see unpack_mask. It is only needed
+    # for reading back, so each band is packed while it is still in cache
+    packed_mask = np.zeros((height, (width + 7) // 8), dtype=np.uint8)
+    
+    channels, range_start, range_span = channel_range_setup(left_bin, right_bin, red_enabled, green_enabled, blue_enabled)
+    if not channels:
+        return packed_mask, 0
+        
+    def mask_band(top):
+        planes_band = channel_planes[:, top:top + MASK_BAND_ROWS]
+        mask_band = np.empty(planes_band.shape[1:], dtype=bool)
+        fill_channel_range_band(planes_band, mask_band, channels, range_start, range_span)
+        packed_mask[top:top + MASK_BAND_ROWS] = np.packbits(mask_band, axis=1)
+        return int(np.count_nonzero(mask_band))
+        
+    return packed_mask, sum(map_row_bands(mask_band, height))
+
+def brighten_masked_copy(image_array, packed_mask, brightness_level, out=None):
+    """Copy a BGRA array with the pixels of a bit-packed mask brightened"""
+    height, width = image_array.shape[:2]
+    
+    # A previous result of the same shape can be passed as out to be overwritten,
+    # which saves allocating and page faulting a new image sized buffer
+    if out is not None and out.shape == image_array.shape:
+        result = out
+    else:
+        result = np.empty_like(image_array, order='C')
+    
+    # Built once here and shared by every band
+    brighten = brightness_lookup(brightness_level)
+    
+    # Copy each band, brightening only the bands that have selected pixels
+    def brighten_band(top):
+        image_band = image_array[top:top + MASK_BAND_ROWS]
+        result_band = result[top:top + MASK_BAND_ROWS]
+        packed_band = packed_mask[top:top + MASK_BAND_ROWS]
+        if not packed_band.any():
+            result_band[:] = image_band
+            return
+        mask_band = unpack_mask(packed_band, width)
+        if LITTLE_ENDIAN and np.count_nonzero(mask_band) * 2 > mask_band.size:
+            brighten_dense_pixels(image_band, result_band, mask_band, brightness_level)
+        else:
+            result_band[:] = image_band
+            brighten_masked_pixels(result_band, mask_band, brighten)
+            
+    map_row_bands(brighten_band, height)
+    return result
+
+def highlight_image(image_array, channel_planes, left_bin, right_bin, red_enabled, green_enabled, blue_enabled, brightness_level, out=None):
+    """Build the bit-packed highlight mask, brightened copy and pixel count of a BGRA array and its planes"""
+    packed_mask, pixel_count = channel_range_packed_mask(channel_planes, left_bin, right_bin, red_enabled, green_enabled, blue_enabled)
+    
+    # With no channels enabled or an empty selection the image is unmodified,
+    # so instead of a copy the input array itself is returned as the result
+    if pixel_count == 0:
+        return packed_mask, image_array, 0
+    return packed_mask, brighten_masked_copy(image_array, packed_mask, brightness_level, out), pixel_count
+
+def unpack_mask(packed_mask, width):
+    """Expand a mask packed by highlight_image back to a boolean (H, width) array"""
+    return np.unpackbits(packed_mask, axis=1, count=width).view(bool)
 
 class ImageProcessorThread(QThread):
     """Background thread for processing image operations"""
     
     # Signal to emit processed results
-    processing_complete = pyqtSignal(object, object, object)  # mask, highlighted_array, pixel_count
+    processing_complete = pyqtSignal(object, object, object)  # packed mask, highlighted_array, pixel_count
     
     def __init__(self):
         super().__init__()
@@ -18,6 +277,16 @@ class ImageProcessorThread(QThread):
         self.pending_work = False
         self.current_params = None
         
+        # Result array handed back by the GUI once it is no longer used, reused as the next output
+        self.spare_result = None
+        
+        # Last packed mask and pixel count, reused when only the brightness changes.
+        # The source array is only weakly referenced, so a replaced image is not kept alive
+        self.mask_image_ref = None
+        self.mask_key = None
+        self.packed_mask = None
+        self.mask_pixel_count = 0
+        
     def run(self):
         """Main thread loop"""
         while self.running:
@@ -29,8 +298,9 @@ class ImageProcessorThread(QThread):
                     self.mutex.unlock()
                     break
                     
-                # Get current parameters
+                # Take over the current parameters, so their arrays are not held once processed
                 params = self.current_params
+                self.current_params = None
                 self.pending_work = False
                 self.mutex.unlock()
                 
@@ -51,6 +321,7 @@ class ImageProcessorThread(QThread):
     def process_image(self, params):
         """Process image with given parameters"""
         image_array = params['image_array']
+        channel_planes = params['channel_planes']
         highlight_center = params['highlight_center']
         highlight_width = params['highlight_width']
         red_enabled = params['red_enabled']
@@ -58,14 +329,6 @@ class ImageProcessorThread(QThread):
         blue_enabled = params['blue_enabled']
         brightness_level = params['brightness_level']
         
-        height, width = image_array.shape[:2]
-        
-        # Early exit if no channels are enabled
-        if not (red_enabled or green_enabled or blue_enabled):
-            empty_mask = np.zeros((height, width), dtype=bool)
-            result = np.array(image_array, copy=True, dtype=np.uint8, order='C')
-            return empty_mask, result, 0
-        
         # Calculate the histogram value range
         center_bin = int(highlight_center * 255)
         half_width_bins = int((highlight_width * 255) / 2)
@@ -73,46 +336,32 @@ class ImageProcessorThread(QThread):
         left_bin = max(0, center_bin - half_width_bins)
         right_bin = min(255, center_bin + half_width_bins)
         
-        # Use numpy's efficient boolean operations
-        mask = np.zeros((height, width), dtype=bool)
-        
-        if blue_enabled:
-            mask |= ((image_array[:, :, 0] >= left_bin) & (image_array[:, :, 0] <= right_bin))
-        if green_enabled:
-            mask |= ((image_array[:, :, 1] >= left_bin) & (image_array[:, :, 1] <= right_bin))
-        if red_enabled:
-            mask |= ((image_array[:, :, 2] >= left_bin) & (image_array[:, :, 2] <= right_bin))
+        self.mutex.lock()
+        spare_result = self.spare_result
+        self.spare_result = None
+        self.mutex.unlock()
         
-        # Create highlighted image efficiently
-        if np.any(mask):
-            # Only create a copy if we need to modify it
-            result = np.array(image_array, copy=True, dtype=np.uint8, order='C')
-            
-            # Apply brightness adjustment instead of white masking
-            # brightness_level is 0.0 to 1.0, representing 0% to 100% of max brightness
-            # Calculate how much to brighten each pixel
-            # For each pixel, we want to brighten it by moving it towards 255
-            # The amount of brightening is controlled by brightness_level
-            
-            # Get the masked pixels
-            masked_pixels = result[mask, :3]  # RGB channels only
-            
-            # Calculate the distance from current value to maximum (255)
-            distance_to_max = 255 - masked_pixels
-            
-            # Apply brightness adjustment: move towards max by brightness_level percentage
-            brightness_adjustment = distance_to_max * brightness_level
-            
-            # Add the adjustment to current values, ensuring we don't exceed 255
-            new_values = np.clip(masked_pixels + brightness_adjustment, 0, 255)
-            
-            # Update the result
-            result[mask, :3] = new_values.astype(np.uint8)
-        else:
-            # No highlighting needed, return original
+        # The mask does not depend on the brightness, so it is only rebuilt when the
+        # image, range or channels changed
+        mask_key = (left_bin, right_bin, red_enabled, green_enabled, blue_enabled)
+        if self.mask_image_ref is None or self.mask_image_ref() is not image_array or mask_key != self.mask_key:
+            self.packed_mask, self.mask_pixel_count = channel_range_packed_mask(
+                channel_planes, left_bin, right_bin, red_enabled, green_enabled, blue_enabled
+            )
+            self.mask_image_ref = weakref.ref(image_array)
+            self.mask_key = mask_key
+        mask = self.packed_mask
+        pixel_count = self.mask_pixel_count
+        
+        # With no channels enabled or no pixels selected the result is the input array itself
+        if pixel_count == 0:
             result = image_array
+        else:
+            result = brighten_masked_copy(image_array, mask, brightness_level, out=spare_result)
         
-        pixel_count = np.sum(mask)
+        # Keep a spare that was not needed for the next run
+        if spare_result is not None and result is not spare_result:
+            self.recycle_result(spare_result)
         
         return mask, result, pixel_count
         
@@ -128,6 +377,14 @@ class ImageProcessorThread(QThread):
         
 
         
+    def recycle_result(self, highlighted_array):
+        """Hand back a result array that nothing references anymore, to be overwritten by the next run"""
+        # The GUI hands results out read-only, this thread owns it again from here on
+        highlighted_array.setflags(write=True)
+        self.mutex.lock()
+        self.spare_result = highlighted_array
+        self.mutex.unlock()
+        
     def stop(self):
         """Stop the thread"""
         try:
@@ -148,13 +405,110 @@ class ImageProcessorThread(QThread):
             # Handle case where Qt objects are already destroyed
             pass
 
+class HistogramJobSignals(QObject):
+    """Signals emitted by a HistogramJob"""
+    
+    # Emits the image cache key and the (3, 256) red, green and blue histograms
+    histograms_ready = pyqtSignal(object, object)
+
+class HistogramJob(QRunnable):
+    """Thread pool job that counts the channel histograms of an image"""
+    
+    def __init__(self, image_array, image_cache_key):
+        super().__init__()
+        self.image_array = image_array
+        self.image_cache_key = image_cache_key
+        self.signals = HistogramJobSignals()
+        
+    def run(self):
+        """Count the histograms and emit them back to the GUI thread"""
+        height, width = self.image_array.shape[:2]
+        
+        # Sample large images on a regular grid so roughly one megapixel is counted,
+        # so the work no longer grows with the image size. The displayed histogram is
+        # then approximate: well filled bins keep their shape, but bins holding only a
+        # few pixels can be missed by the sample and drop to 0 on the log scale
+        stride = max(1, int(np.sqrt((height * width) / (1024 * 1024))))
+        sample = self.image_array[::stride, ::stride]
+        
+        # Calculate histograms for each channel into one contiguous (3, 256) buffer,
+        # one row per channel in red, green, blue order
+        # Pixel values are uint8, so each value is its own bin and a plain bincount
+        # gives the same result as np.histogram without the bin-edge search
+        # Note: QImage.bits() returns BGRA format, not RGBA
+        channel_histograms = np.zeros((3, 256), dtype=np.int64)
+        channel_histograms[0] = np.bincount(sample[:, :, 2].ravel(), minlength=256)  # Channel 2 = Red
+        channel_histograms[1] = np.bincount(sample[:, :, 1].ravel(), minlength=256)  # Channel 1 = Green
+        channel_histograms[2] = np.bincount(sample[:, :, 0].ravel(), minlength=256)  # Channel 0 = Blue
+        
+        self.signals.histograms_ready.emit(self.image_cache_key, channel_histograms)
+
+class PixelCountJobSignals(QObject):
+    """Signals emitted by a PixelCountJob"""
+    
+    # Emits the image cache key, the count key, the pixel count and the running value
+    # counts of the single enabled channel plane (None when several channels are enabled)
+    pixel_count_ready = pyqtSignal(object, object, object, object)
+
+class PixelCountJob(QRunnable):
+    """Thread pool job that counts the pixels in a bin range of an image"""
+    
+    def __init__(self, channel_planes, image_cache_key, count_key):
+        super().__init__()
+        self.channel_planes = channel_planes
+        self.image_cache_key = image_cache_key
+        self.count_key = count_key
+        self.signals = PixelCountJobSignals()
+        
+    def run(self):
+        """Count the pixels and emit the count back to the GUI thread"""
+        left_bin, right_bin, red_enabled, green_enabled, blue_enabled = self.count_key
+        channels = channel_range_setup(left_bin, right_bin, red_enabled, green_enabled, blue_enabled)[0]
+        
+        # With a single channel, the running value counts answer this and every later
+        # range of that channel, so they are built and sent back instead of a plain count
+        cumulative_counts = None
+        if len(channels) == 1:
+            cumulative_counts = cumulative_value_counts(self.channel_planes[channels[0]])
+            pixel_count = cumulative_range_count(cumulative_counts, left_bin, right_bin)
+        else:
+            pixel_count = channel_range_count(self.channel_planes, left_bin, right_bin, red_enabled, green_enabled, blue_enabled)
+            
+        self.signals.pixel_count_ready.emit(self.image_cache_key, self.count_key, pixel_count, cumulative_counts)
+
 class HistogramContainer(QWidget):
     """Container widget that handles histogram painting"""
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent_widget = parent
-        self.setMouseTracking(True)
+        
+        # Mouse tracking stays off: the highlight only follows the mouse while dragging,
+        # and Qt delivers move events during a drag without it
+        
+        # Cached rendering of the histogram bars and axis labels
+        self.bars_pixmap = None
+        self.bars_cache_key = None
+        
+        # Coalesce mouse movement to at most ~60 highlight updates per second
+        self.repaint_timer = QTimer(self)
+        self.repaint_timer.setSingleShot(True)
+        self.repaint_timer.setInterval(16)
+        self.repaint_timer.timeout.connect(self.flush_highlight_repaint)
+        
+        # Latest drag position not yet applied to the highlight
+        self.pending_mouse_pos = None
+        
+        # Highlight area currently on screen, used to repaint only what a drag changed
+        self.painted_highlight_region = None
+        
+        # Cached rendering of the highlight overlay
+        self.overlay_pixmap = None
+        self.overlay_cache_key = None
+        
+        # Cached highlight line positions
+        self.line_positions = None
+        self.line_positions_cache_key = None
         
     def mousePressEvent(self, event):
         """Handle mouse press events"""
@@ -172,7 +526,7 @@ class HistogramContainer(QWidget):
                 # Click while locked: unlock
                 self.parent_widget.is_locked = False
                 self.parent_widget.lock_button.setChecked(False)
-                self.parent_widget.lock_button.setText("🔓")
+                self.parent_widget.lock_button.setIcon(self.parent_widget.unlocked_icon)
                 
     def mouseMoveEvent(self, event):
         """Handle mouse move events"""
@@ -180,15 +534,32 @@ class HistogramContainer(QWidget):
             return
             
         if self.parent_widget.is_highlighting and not self.parent_widget.is_locked:
-            # Update highlight while dragging
-            self.update_highlight_from_mouse(event.pos())
-            self.update()
+            # Only remember the position, the timer applies the latest one once per frame
+            self.pending_mouse_pos = event.pos()
+            if not self.repaint_timer.isActive():
+                self.repaint_timer.start()
+            
+    def flush_highlight_repaint(self):
+        """Apply the latest drag position and repaint the area covered by the previous and current highlight"""
+        if self.pending_mouse_pos is None:
+            return
+        previous_bin_range = self.parent_widget.highlight_bin_range()
+        self.update_highlight_from_mouse(self.pending_mouse_pos)
+        self.pending_mouse_pos = None
+        
+        # The processed image and pixel count only depend on the whole-bin range,
+        # so movement within the same bins needs no new processing
+        if self.parent_widget.highlight_bin_range() != previous_bin_range:
             self.parent_widget.request_highlight_update()
-        elif not self.parent_widget.is_locked:
-            # Update highlight in real-time when not locked
-            self.update_highlight_from_mouse(event.pos())
+            
+        # Nothing on screen changes unless the highlight lines moved
+        highlight_region = self.highlight_region()
+        if highlight_region is not None and highlight_region == self.painted_highlight_region:
+            return
+        if highlight_region is None or self.painted_highlight_region is None:
             self.update()
-            self.parent_widget.request_highlight_update()
+        else:
+            self.update(highlight_region.united(self.painted_highlight_region))
             
     def mouseReleaseEvent(self, event):
         """Handle mouse release events"""
@@ -196,11 +567,15 @@ class HistogramContainer(QWidget):
             return
             
         if event.button() == Qt.MouseButton.LeftButton and self.parent_widget.is_highlighting:
+            # Apply a drag position still waiting for the timer before locking
+            self.repaint_timer.stop()
+            self.flush_highlight_repaint()
+            
             # Lock the position when mouse is released
             self.parent_widget.is_highlighting = False
             self.parent_widget.is_locked = True
             self.parent_widget.lock_button.setChecked(True)
-            self.parent_widget.lock_button.setText("🔒")
+            self.parent_widget.lock_button.setIcon(self.parent_widget.locked_icon)
             self.parent_widget.request_highlight_update()
             
     def update_highlight_from_mouse(self, pos):
@@ -211,13 +586,9 @@ class HistogramContainer(QWidget):
         hist_width = self.width() - 20
         hist_height = self.height() - 20
         
-        # Get zoom and scroll information from parent
-        zoom_level = getattr(self.parent_widget, 'zoom_level', 1)
-        scroll_position = getattr(self.parent_widget, 'scroll_position', 0)
-        
-        # Calculate the visible range of histogram values
-        total_visible_bins = 256 // zoom_level
-        start_bin = int(scroll_position * (256 - total_visible_bins))
+        # Get zoom and the visible range of histogram values from parent
+        zoom_level = self.parent_widget.zoom_level
+        start_bin, total_visible_bins = self.parent_widget.visible_bin_range()
         
         # Calculate center position (0.0 to 1.0) - maps to visible histogram value range
         if hist_width > 0:
@@ -234,19 +605,24 @@ class HistogramContainer(QWidget):
             base_width = (1.0 - relative_y) * 0.1
             self.parent_widget.highlight_width = base_width / zoom_level
         
+    def invalidate_bars(self):
+        """Drop the cached histogram bars so they are re-rendered on the next paint"""
+        self.bars_pixmap = None
+        self.bars_cache_key = None
+        
     def paintEvent(self, event):
         """Paint the histogram in this container"""
         super().paintEvent(event)
         
-        if not hasattr(self.parent_widget, 'red_histogram') or self.parent_widget.red_histogram is None:
+        # Nothing would reach the screen when the container is hidden or fully covered
+        if self.visibleRegion().isEmpty():
+            self.painted_highlight_region = None
+            return
+            
+        if not hasattr(self.parent_widget, 'channel_histograms') or self.parent_widget.channel_histograms is None:
+            self.painted_highlight_region = None
             return
             
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        # Fill the container background
-        painter.fillRect(self.rect(), QColor(255, 255, 255))
-        
         # Get histogram dimensions
         hist_x = 10
         hist_y = 10
@@ -255,156 +631,284 @@ class HistogramContainer(QWidget):
         hist_height = self.height() - 40  # 20px top margin + 20px bottom margin for labels
         
         # Get zoom and scroll information from parent
-        zoom_level = getattr(self.parent_widget, 'zoom_level', 1)
-        scroll_position = getattr(self.parent_widget, 'scroll_position', 0)
+        zoom_level = self.parent_widget.zoom_level
+        scroll_position = self.parent_widget.scroll_position
         
         # Calculate the visible range of histogram values
-        total_visible_bins = 256 // zoom_level
-        start_bin = int(scroll_position * (256 - total_visible_bins))
+        start_bin, total_visible_bins = self.parent_widget.visible_bin_range()
         end_bin = start_bin + total_visible_bins
         
-        # Find maximum value for normalization in the visible range
-        max_value = 0
-        if self.parent_widget.red_channel_enabled:
-            max_value = max(max_value, np.max(self.parent_widget.red_histogram[start_bin:end_bin]))
-        if self.parent_widget.green_channel_enabled:
-            max_value = max(max_value, np.max(self.parent_widget.green_histogram[start_bin:end_bin]))
-        if self.parent_widget.blue_channel_enabled:
-            max_value = max(max_value, np.max(self.parent_widget.blue_histogram[start_bin:end_bin]))
+        # The bars and axis labels only change with the data, size, zoom, scroll or
+        # channel toggles, so they are rendered once into a pixmap and blitted on every other repaint
+        cache_key = (
+            self.width(),
+            self.height(),
+            self.devicePixelRatioF(),
+            zoom_level,
+            scroll_position,
+            self.parent_widget.red_channel_enabled,
+            self.parent_widget.green_channel_enabled,
+            self.parent_widget.blue_channel_enabled
+        )
+        if self.bars_pixmap is None or cache_key != self.bars_cache_key:
+            self.bars_pixmap = self.render_bars(hist_x, hist_y, hist_width, hist_height, start_bin, end_bin)
+            self.bars_cache_key = cache_key
+            
+        painter = QPainter(self)
         
-        if max_value == 0:
+        if self.bars_pixmap is None:
+            # Nothing to plot, just fill the container background
+            painter.fillRect(self.rect(), BACKGROUND_COLOR)
+            self.painted_highlight_region = None
             return
             
-        # Draw histogram
-        bar_width = hist_width / total_visible_bins
-        
-        # Apply logarithmic scaling to histogram values
-        # Add 1 to avoid log(0) and ensure all values are positive
-        log_red = np.log(self.parent_widget.red_histogram[start_bin:end_bin] + 1)
-        log_green = np.log(self.parent_widget.green_histogram[start_bin:end_bin] + 1)
-        log_blue = np.log(self.parent_widget.blue_histogram[start_bin:end_bin] + 1)
-        
-        # Find maximum log value for normalization
-        max_log_value = 0
-        if self.parent_widget.red_channel_enabled:
-            max_log_value = max(max_log_value, np.max(log_red))
-        if self.parent_widget.green_channel_enabled:
-            max_log_value = max(max_log_value, np.max(log_green))
-        if self.parent_widget.blue_channel_enabled:
-            max_log_value = max(max_log_value, np.max(log_blue))
-        
-        # Draw red histogram (50% transparency fill, 90% transparency line)
-        red_fill = QColor(255, 0, 0, 128)  # 50% transparency
-        red_line = QColor(255, 0, 0, 26)   # 90% transparency
-        
-        if self.parent_widget.red_channel_enabled:
-            painter.setBrush(QBrush(red_fill))
-            painter.setPen(QPen(red_line, 1))
-            
-            for i in range(total_visible_bins):
-                x = hist_x + i * bar_width
-                # Use logarithmic normalization
-                normalized_height = (log_red[i] / max_log_value) * hist_height
-                y = hist_y + hist_height - normalized_height
-                painter.drawRect(QRect(int(x), int(y), int(bar_width), int(normalized_height)))
-            
-        # Draw green histogram
-        green_fill = QColor(0, 255, 0, 128)  # 50% transparency
-        green_line = QColor(0, 255, 0, 26)   # 90% transparency
-        
-        if self.parent_widget.green_channel_enabled:
-            painter.setBrush(QBrush(green_fill))
-            painter.setPen(QPen(green_line, 1))
-            
-            for i in range(total_visible_bins):
-                x = hist_x + i * bar_width
-                # Use logarithmic normalization
-                normalized_height = (log_green[i] / max_log_value) * hist_height
-                y = hist_y + hist_height - normalized_height
-                painter.drawRect(QRect(int(x), int(y), int(bar_width), int(normalized_height)))
-            
-        # Draw blue histogram
-        blue_fill = QColor(0, 0, 255, 128)  # 50% transparency
-        blue_line = QColor(0, 0, 255, 26)   # 90% transparency
-        
-        if self.parent_widget.blue_channel_enabled:
-            painter.setBrush(QBrush(blue_fill))
-            painter.setPen(QPen(blue_line, 1))
-            
-            for i in range(total_visible_bins):
-                x = hist_x + i * bar_width
-                # Use logarithmic normalization
-                normalized_height = (log_blue[i] / max_log_value) * hist_height
-                y = hist_y + hist_height - normalized_height
-                painter.drawRect(QRect(int(x), int(y), int(bar_width), int(normalized_height)))
+        # Remember which highlight ends up on screen. A partial repaint only brings the
+        # screen up to date if it covers both the previous and the current highlight
+        dirty_rect = event.rect()
+        highlight_region = self.highlight_region()
+        if dirty_rect.contains(self.rect()):
+            self.painted_highlight_region = highlight_region
+        elif (highlight_region is not None and self.painted_highlight_region is not None
+                and dirty_rect.contains(highlight_region.united(self.painted_highlight_region))):
+            self.painted_highlight_region = highlight_region
+        else:
+            self.painted_highlight_region = None
+            
+        # Qt clips painting to the dirty rect, so a partial update only blits that part
+        painter.drawPixmap(0, 0, self.bars_pixmap)
             
         # Draw highlight overlay only if enabled
         if hasattr(self.parent_widget, 'highlight_enabled') and self.parent_widget.highlight_enabled:
             self.draw_highlight_overlay(painter, hist_width, hist_height, hist_x, hist_y)
+        
+    def render_bars(self, hist_x, hist_y, hist_width, hist_height, start_bin, end_bin):
+        """Render the visible histogram bars into a pixmap, or return None if there is nothing to draw"""
+        total_visible_bins = end_bin - start_bin
+        
+        # Rows of the enabled channels in drawing order, so the overlapping bars
+        # blend the same way every time
+        enabled = [
+            row for row, channel_enabled in enumerate((
+                self.parent_widget.red_channel_enabled,
+                self.parent_widget.green_channel_enabled,
+                self.parent_widget.blue_channel_enabled,
+            )) if channel_enabled
+        ]
+        if not enabled:
+            return None
+            
+        # Bars narrower than a pixel cannot be told apart, so when the plot is
+        # narrower than the visible range, neighbouring bins are summed into one bar per pixel
+        draw_bins = max(1, min(total_visible_bins, hist_width))
+        if draw_bins < total_visible_bins:
+            visible_histograms = self.parent_widget.channel_histograms[enabled, start_bin:end_bin]
+            group_starts = np.arange(draw_bins) * total_visible_bins // draw_bins
+            grouped_histograms = np.add.reduceat(visible_histograms, group_starts, axis=1)
+            
+            # Apply logarithmic scaling to all enabled histograms at once
+            # Add 1 to avoid log(0) and ensure all values are positive
+            log_histograms = np.log(grouped_histograms + 1)
+        else:
+            # One bar per bin, so the log scaling computed with the histograms can be reused
+            log_histograms = self.parent_widget.log_channel_histograms[enabled, start_bin:end_bin]
+        
+        # Find maximum log value for normalization across every enabled channel
+        max_log_value = log_histograms.max() if log_histograms.size else 0
+        
+        # log(count + 1) is zero only for empty bins, so this also covers an empty visible range
+        if max_log_value == 0:
+            return None
             
+        # Match the screen's pixel density so the cached bars stay sharp on HiDPI displays
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(int(self.width() * ratio), int(self.height() * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(BACKGROUND_COLOR)
+        
+        painter = QPainter(pixmap)
+        
         # Draw axis labels with black text for better contrast
-        painter.setPen(QColor(0, 0, 0))
+        # They only depend on the visible range, so they are cached along with the bars
+        painter.setPen(TEXT_COLOR)
         # Position labels in the reserved bottom space
         label_y = hist_y + hist_height + 15  # 15px below histogram, 5px above bottom edge
         painter.drawText(hist_x, label_y, str(start_bin))
         painter.drawText(hist_x + hist_width - 30, label_y, str(end_bin))
         
-    def draw_highlight_overlay(self, painter, hist_width, hist_height, hist_x, hist_y):
-        """Draw the highlight overlay showing the selected histogram range"""
+        # The plot area is rasterized at device resolution
+        plot_width = int(hist_width * ratio)
+        plot_height = int(hist_height * ratio)
+        if plot_width <= 0 or plot_height <= 0:
+            painter.end()
+            return pixmap
+            
+        # Scale every bar height in one shot, giving a (channels, bins) integer array
+        heights = (log_histograms * (plot_height / max_log_value)).astype(np.int32)
+        
+        # Integer bar edges spread the leftover pixels evenly, so adjacent bars never leave gaps
+        edges = np.arange(draw_bins + 1) * plot_width // draw_bins
+        
+        # Draw histogram as a single image instead of one rectangle per bar
+        plot = self.rasterize_bars(heights, enabled, edges, plot_width, plot_height)
+        image = QImage(plot.data, plot_width, plot_height, 3 * plot_width, QImage.Format.Format_RGB888)
+        painter.drawImage(QRect(hist_x, hist_y, hist_width, hist_height), image)
+        painter.end()
+        return pixmap
+        
+    def rasterize_bars(self, heights, enabled, edges, plot_width, plot_height):
+        """Composite the semi-transparent bars of the enabled channels into an RGB array"""
+        # This approximates drawing every bar with an antialiased QPainter rectangle. The
+        # outlines here cover whole pixels instead of blending into their neighbours, so
+        # the result looks the same but differs at bar outlines and edges
+        rows = np.arange(plot_height)[:, None]
+        widths = np.diff(edges)
+        
+        # Leftmost pixel column of every bar, where the faint bar outline runs
+        bar_starts = np.zeros(plot_width, dtype=bool)
+        bar_starts[edges[:-1][widths > 0]] = True
+        
+        # Each channel leaves a pixel uncovered (0), filled (1) or filled and outlined (2),
+        # so every pixel gets a base-3 code over the enabled channels
+        codes = np.zeros((plot_height, plot_width), dtype=np.uint8)
+        place = 1
+        for channel_heights in heights:
+            # Top of the bar covering each pixel column
+            tops = plot_height - np.repeat(channel_heights, widths)
+            inside = rows >= tops
+            outline = inside & ((rows == tops) | bar_starts)
+            codes += (inside.astype(np.uint8) + outline) * np.uint8(place)
+            place *= 3
+            
+        # Source-over blend every combination once, in drawing order, then look the pixels up
+        lookup = np.empty((place, 3), dtype=np.float64)
+        for code in range(place):
+            color = np.array(BACKGROUND_COLOR.getRgb()[:3], dtype=np.float64)
+            for digit, row in enumerate(enabled):
+                state = code // 3 ** digit % 3
+                layers = (CHANNEL_BRUSHES[row].color(), CHANNEL_PENS[row].color())[:state]
+                for layer in layers:
+                    alpha = layer.alpha() / 255.0
+                    color = color * (1.0 - alpha) + np.array(layer.getRgb()[:3]) * alpha
+            lookup[code] = color
+            
+        return np.rint(lookup).astype(np.uint8)[codes]
+        
+    def highlight_line_positions(self, hist_width, hist_x):
+        """Get the x positions of the left and right highlight lines, or None if no highlight is drawn"""
         if not hasattr(self.parent_widget, 'highlight_width') or self.parent_widget.highlight_width <= 0:
-            return
+            return None
             
         # Get zoom and scroll information from parent
-        zoom_level = getattr(self.parent_widget, 'zoom_level', 1)
-        scroll_position = getattr(self.parent_widget, 'scroll_position', 0)
+        zoom_level = self.parent_widget.zoom_level
+        scroll_position = self.parent_widget.scroll_position
         
+        # A frame asks for the line positions several times, so they are only
+        # recomputed when the highlight, zoom, scroll or geometry changes
+        cache_key = (
+            self.parent_widget.highlight_center,
+            self.parent_widget.highlight_width,
+            zoom_level,
+            scroll_position,
+            hist_width,
+            hist_x
+        )
+        if cache_key != self.line_positions_cache_key:
+            self.line_positions = self.compute_line_positions(hist_width, hist_x)
+            self.line_positions_cache_key = cache_key
+        return self.line_positions
+        
+    def compute_line_positions(self, hist_width, hist_x):
+        """Compute the clamped x positions of the highlight lines, or None if the center is scrolled out of view"""
         # Calculate the visible range of histogram values
-        total_visible_bins = 256 // zoom_level
-        start_bin = int(scroll_position * (256 - total_visible_bins))
+        start_bin, total_visible_bins = self.parent_widget.visible_bin_range()
         
         # Calculate highlight area bounds in histogram coordinates
         # Map highlight center from global histogram space to visible space
         global_center_bin = self.parent_widget.highlight_center * 255
         visible_center = (global_center_bin - start_bin) / total_visible_bins
         
-        if 0 <= visible_center <= 1:
-            center_x = hist_x + (visible_center * hist_width)
-            half_width = (self.parent_widget.highlight_width * hist_width) / 2
-            
-            left_line_x = int(center_x - half_width)
-            right_line_x = int(center_x + half_width)
+        if not 0 <= visible_center <= 1:
+            return None
             
-            # Clamp to histogram bounds
-            left_line_x = max(hist_x, left_line_x)
-            right_line_x = min(hist_x + hist_width, right_line_x)
+        center_x = hist_x + (visible_center * hist_width)
+        half_width = (self.parent_widget.highlight_width * hist_width) / 2
+        
+        left_line_x = int(center_x - half_width)
+        right_line_x = int(center_x + half_width)
+        
+        # Clamp to histogram bounds
+        left_line_x = max(hist_x, left_line_x)
+        right_line_x = min(hist_x + hist_width, right_line_x)
+        
+        return left_line_x, right_line_x
+        
+    def highlight_region(self):
+        """Get the container area covered by the highlight lines and fill, or None if no highlight is drawn"""
+        if not hasattr(self.parent_widget, 'highlight_enabled') or not self.parent_widget.highlight_enabled:
+            return None
             
-            # Draw left vertical line
-            painter.setPen(QPen(QColor(0, 0, 0), 2))
-            painter.drawLine(left_line_x, hist_y, left_line_x, hist_y + hist_height)
+        line_positions = self.highlight_line_positions(self.width() - 20, 10)
+        if line_positions is None:
+            return None
             
-            # Draw right vertical line
-            painter.drawLine(right_line_x, hist_y, right_line_x, hist_y + hist_height)
+        # Pad by the 2px line width on both sides
+        left_line_x, right_line_x = line_positions
+        return QRect(left_line_x - 2, 0, right_line_x - left_line_x + 5, self.height())
+        
+    def draw_highlight_overlay(self, painter, hist_width, hist_height, hist_x, hist_y):
+        """Draw the highlight overlay showing the selected histogram range"""
+        line_positions = self.highlight_line_positions(hist_width, hist_x)
+        if line_positions is None:
+            return
+        left_line_x, right_line_x = line_positions
+        
+        # The overlay only depends on its geometry, so a locked highlight is a single blit
+        cache_key = (left_line_x, right_line_x, hist_x, hist_y, hist_width, hist_height, self.devicePixelRatioF())
+        if self.overlay_pixmap is None or cache_key != self.overlay_cache_key:
+            self.overlay_pixmap = self.render_overlay(left_line_x, right_line_x, hist_width, hist_height, hist_x, hist_y)
+            self.overlay_cache_key = cache_key
             
-            # Create semi-transparent overlay to highlight the selected range
-            highlight_brush = QBrush(QColor(255, 255, 0, 80))  # Yellow with 30% opacity
+        painter.drawPixmap(0, 0, self.overlay_pixmap)
+        
+    def render_overlay(self, left_line_x, right_line_x, hist_width, hist_height, hist_x, hist_y):
+        """Render the highlight lines and shading into a transparent pixmap"""
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(int(self.width() * ratio), int(self.height() * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        
+        painter = QPainter(pixmap)
+        
+        # Only the lines need antialiasing, the filled areas are integer rectangles
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
             
-            # Highlight the selected range
-            if left_line_x < right_line_x:
-                highlight_rect = QRect(left_line_x, hist_y, right_line_x - left_line_x, hist_height)
-                painter.fillRect(highlight_rect, highlight_brush)
+        # Draw left vertical line
+        painter.setPen(HIGHLIGHT_LINE_PEN)
+        painter.drawLine(left_line_x, hist_y, left_line_x, hist_y + hist_height)
+        
+        # Draw right vertical line
+        painter.drawLine(right_line_x, hist_y, right_line_x, hist_y + hist_height)
+        
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+        
+        # Highlight the selected range with a semi-transparent overlay
+        if left_line_x < right_line_x:
+            highlight_rect = QRect(left_line_x, hist_y, right_line_x - left_line_x, hist_height)
+            painter.fillRect(highlight_rect, HIGHLIGHT_BRUSH)
+        
+        # Gray out non-highlighted areas with a semi-transparent overlay
+        # Left gray area
+        if left_line_x > hist_x:
+            left_rect = QRect(hist_x, hist_y, left_line_x - hist_x, hist_height)
+            painter.fillRect(left_rect, OVERLAY_BRUSH)
             
-            # Create semi-transparent overlay to gray out non-highlighted areas
-            overlay_brush = QBrush(QColor(128, 128, 128, 180))  # Gray with 70% opacity
+        # Right gray area
+        if right_line_x < hist_x + hist_width:
+            right_rect = QRect(right_line_x, hist_y, (hist_x + hist_width) - right_line_x, hist_height)
+            painter.fillRect(right_rect, OVERLAY_BRUSH)
             
-            # Left gray area
-            if left_line_x > hist_x:
-                left_rect = QRect(hist_x, hist_y, left_line_x - hist_x, hist_height)
-                painter.fillRect(left_rect, overlay_brush)
-                
-            # Right gray area
-            if right_line_x < hist_x + hist_width:
-                right_rect = QRect(right_line_x, hist_y, (hist_x + hist_width) - right_line_x, hist_height)
-                painter.fillRect(right_rect, overlay_brush)
+        painter.end()
+        return pixmap
 
 class HistogramWidget(QWidget):
     """Widget for displaying RGB histograms with transparency and zoom functionality"""
@@ -416,14 +920,22 @@ class HistogramWidget(QWidget):
         super().__init__(parent)
         self.setup_ui()
         
-        # Store histogram data
-        self.red_histogram = None
-        self.green_histogram = None
-        self.blue_histogram = None
+        # Store histogram data as one (3, 256) array with red, green, blue rows
+        self.channel_histograms = None
+        
+        # Logarithmic scaling of channel_histograms, computed once per image for painting
+        self.log_channel_histograms = None
         
         # Store original image data for processing
         self.original_image_array = None
         
+        # The same B, G, R channels as separate contiguous planes for the range kernels
+        self.channel_planes = None
+        
+        # Subsampled copies processed while dragging, for quick approximate feedback
+        self.preview_image_array = None
+        self.preview_channel_planes = None
+        
         # Highlight state
         self.highlight_enabled = True
         self.is_highlighting = False
@@ -465,6 +977,39 @@ class HistogramWidget(QWidget):
         # Cache key for avoiding redundant processing
         self.last_cache_key = None
         
+        # Exact pixel counts of the current image by bin range and enabled channels
+        self.pixel_count_cache = {}
+        
+        # Running value counts of the current image by channel plane, for single-channel counts
+        self.cumulative_channel_counts = {}
+        
+        # Cache key of the pixmap the histograms were computed from
+        self.image_cache_key = None
+        
+        # Pixmap received while hidden, processed when the widget is shown
+        self.pending_pixmap = None
+        
+        # Background job counting the histograms of the current image
+        self.histogram_job = None
+        
+        # Background job counting the pixels of the latest uncached range
+        self.pixel_count_job = None
+        
+    @property
+    def red_histogram(self):
+        """Red channel histogram, a view into channel_histograms"""
+        return None if self.channel_histograms is None else self.channel_histograms[0]
+    
+    @property
+    def green_histogram(self):
+        """Green channel histogram, a view into channel_histograms"""
+        return None if self.channel_histograms is None else self.channel_histograms[1]
+    
+    @property
+    def blue_histogram(self):
+        """Blue channel histogram, a view into channel_histograms"""
+        return None if self.channel_histograms is None else self.channel_histograms[2]
+    
     def setup_ui(self):
         """Setup the histogram widget UI"""
         layout = QVBoxLayout(self)
@@ -497,8 +1042,11 @@ class HistogramWidget(QWidget):
         self.toggle_button.setFixedHeight(28)
         highlight_layout.addWidget(self.toggle_button)
         
-        # Lock/unlock button with emoji
-        self.lock_button = QPushButton("🔓")  # Unlocked emoji
+        # Lock/unlock button with emoji, prerendered once as icons
+        self.locked_icon = glyph_icon("🔒")
+        self.unlocked_icon = glyph_icon("🔓")
+        self.lock_button = QPushButton()
+        self.lock_button.setIcon(self.unlocked_icon)
         self.lock_button.setCheckable(True)
         self.lock_button.clicked.connect(self.toggle_lock)
         self.lock_button.setFixedSize(40, 28)  # Make it square-ish for the emoji
@@ -691,9 +1239,9 @@ class HistogramWidget(QWidget):
         """Toggle lock state"""
         self.is_locked = not self.is_locked
         if self.is_locked:
-            self.lock_button.setText("🔒")  # Locked emoji
+            self.lock_button.setIcon(self.locked_icon)
         else:
-            self.lock_button.setText("🔓")  # Unlocked emoji
+            self.lock_button.setIcon(self.unlocked_icon)
         
     def toggle_red_channel(self):
         """Toggle the red channel on/off"""
@@ -733,25 +1281,60 @@ class HistogramWidget(QWidget):
             self.clear_histogram()
             return
             
+        # Defer the work until the widget is actually shown
+        if not self.isVisible():
+            self.pending_pixmap = pixmap
+            return
+        self.pending_pixmap = None
+            
+        # Skip recomputation when the same image is set again
+        image_cache_key = pixmap.cacheKey()
+        if image_cache_key == self.image_cache_key:
+            return
+        self.image_cache_key = image_cache_key
+            
         # Convert QPixmap to numpy array for histogram calculation
+        # Format_RGB32 and Format_ARGB32 are both stored as BGRA bytes with unpremultiplied
+        # colors. Anything else, including premultiplied alpha whose color values would skew
+        # the histogram, is converted once to Format_RGB32
         image = pixmap.toImage()
+        if image.format() not in (QImage.Format.Format_RGB32, QImage.Format.Format_ARGB32):
+            image = image.convertToFormat(QImage.Format.Format_RGB32)
         width = image.width()
         height = image.height()
         
-        # Get pixel data
-        ptr = image.bits()
-        ptr.setsize(height * width * 4)  # 4 bytes per pixel (RGBA)
-        arr = np.frombuffer(ptr, np.uint8).reshape((height, width, 4))
+        # Get pixel data without detaching the image, honouring the real row stride
+        bytes_per_line = image.bytesPerLine()
+        ptr = image.constBits()
+        ptr.setsize(height * bytes_per_line)
+        arr = np.frombuffer(ptr, np.uint8).reshape((height, bytes_per_line))[:, :width * 4].reshape((height, width, 4))
         
         # Store original image data for processing
-        # Make sure we have a completely independent copy
-        self.original_image_array = arr.copy().astype(np.uint8)
+        # Make sure we have a completely independent copy. The buffer is already uint8,
+        # so a single copy is enough. All four BGRA bytes are kept, since rows of 32-bit
+        # pixels can be handed to a QImage as they are
+        self.original_image_array = arr.copy()
+        self.channel_planes = split_channel_planes(arr)
+        self.pixel_count_cache = {}
+        self.cumulative_channel_counts = {}
+        self.pixel_count_job = None
+        
+        # Subsample large images on a regular grid to about PREVIEW_PIXELS for dragging
+        preview_step = max(1, int(np.sqrt((height * width) / PREVIEW_PIXELS)))
+        if preview_step > 1:
+            self.preview_image_array = arr[::preview_step, ::preview_step].copy()
+            self.preview_channel_planes = split_channel_planes(self.preview_image_array)
+        else:
+            self.preview_image_array = self.original_image_array
+            self.preview_channel_planes = self.channel_planes
         
-        # Calculate histograms for each channel
-        # Note: QImage.bits() returns BGRA format, not RGBA
-        self.blue_histogram = np.histogram(arr[:, :, 0], bins=256, range=(0, 256))[0]  # Channel 0 = Blue
-        self.green_histogram = np.histogram(arr[:, :, 1], bins=256, range=(0, 256))[0]  # Channel 1 = Green
-        self.red_histogram = np.histogram(arr[:, :, 2], bins=256, range=(0, 256))[0]   # Channel 2 = Red
+        # Count the histograms on the thread pool so the GUI stays responsive.
+        # Until they arrive the histogram area stays empty
+        self.channel_histograms = None
+        self.log_channel_histograms = None
+        self.histogram_job = HistogramJob(self.original_image_array, image_cache_key)
+        self.histogram_job.signals.histograms_ready.connect(self.on_histograms_ready)
+        QThreadPool.globalInstance().start(self.histogram_job)
         
         # Reset zoom and scroll when new image is loaded
         self.zoom_level = 1
@@ -780,22 +1363,33 @@ class HistogramWidget(QWidget):
         self.last_cache_key = None
         
         # Update the display
+        self.histogram_container.invalidate_bars()
         self.histogram_container.update()
         self.update_pixel_counter()
         
-    def get_highlight_mask(self):
-        """Get a boolean mask indicating which pixels have color channel values in the highlighted histogram range"""
-        if self.original_image_array is None or not self.highlight_enabled:
-            return None
-            
-        # Return cached mask if available
-        if self.highlight_mask is not None:
-            return self.highlight_mask.copy()
+    def on_histograms_ready(self, image_cache_key, channel_histograms):
+        """Store the histograms counted by a HistogramJob and repaint"""
+        # Ignore results for an image that has since been replaced or cleared
+        if image_cache_key != self.image_cache_key:
+            return
             
-        # Fallback to real-time calculation if no cache
-        height, width = self.original_image_array.shape[:2]
-        mask = np.zeros((height, width), dtype=bool)
+        self.channel_histograms = channel_histograms
         
+        # Add 1 to avoid log(0) and ensure all values are positive
+        self.log_channel_histograms = np.log(channel_histograms + 1)
+        self.histogram_job = None
+        
+        self.histogram_container.invalidate_bars()
+        self.histogram_container.update()
+        
+    def visible_bin_range(self):
+        """Get the (start_bin, total_visible_bins) range of histogram bins shown at the current zoom and scroll"""
+        total_visible_bins = 256 // self.zoom_level
+        start_bin = int(self.scroll_position * (256 - total_visible_bins))
+        return start_bin, total_visible_bins
+        
+    def highlight_bin_range(self):
+        """Get the (left_bin, right_bin) range of histogram bins covered by the highlight"""
         # Calculate the histogram value range based on highlight position and width
         # highlight_center (0.0 to 1.0) maps to histogram bin 0-255
         center_bin = int(self.highlight_center * 255)
@@ -804,70 +1398,58 @@ class HistogramWidget(QWidget):
         # Calculate the range of histogram bins to highlight
         left_bin = max(0, center_bin - half_width_bins)
         right_bin = min(255, center_bin + half_width_bins)
+        return left_bin, right_bin
         
-        # Create a mask for pixels that fall within this value range
-        # Check if any of the RGB channels fall within the highlighted range
-        # Note: QImage.bits() returns BGRA format, so channels are [Blue, Green, Red, Alpha]
-        blue_channel = self.original_image_array[:, :, 0]   # Blue
-        green_channel = self.original_image_array[:, :, 1]  # Green  
-        red_channel = self.original_image_array[:, :, 2]    # Red
-        
-        # Pixels are highlighted if their value is within the highlighted range
-        blue_mask = (blue_channel >= left_bin) & (blue_channel <= right_bin)
-        green_mask = (green_channel >= left_bin) & (green_channel <= right_bin)
-        red_mask = (red_channel >= left_bin) & (red_channel <= right_bin)
-        
-        # Only include masks for enabled channels
-        if self.blue_channel_enabled:
-            mask |= blue_mask
-        if self.green_channel_enabled:
-            mask |= green_mask
-        if self.red_channel_enabled:
-            mask |= red_mask
+    def get_highlight_mask(self):
+        """Get a boolean mask indicating which pixels have color channel values in the highlighted histogram range"""
+        if self.original_image_array is None or not self.highlight_enabled:
+            return None
+            
+        # Return cached mask if available, unpacking it makes a new array. A mask from the
+        # subsampled drag preview does not cover every pixel, so it is not used here
+        if self.highlight_mask is not None and self.highlighted_image.shape[:2] == self.original_image_array.shape[:2]:
+            return unpack_mask(self.highlight_mask, self.highlighted_image.shape[1])
+            
+        # Fallback to real-time calculation if no cache
+        left_bin, right_bin = self.highlight_bin_range()
         
-        return mask
+        # Pixels are highlighted if any enabled channel value is within the highlighted range
+        return channel_range_mask(
+            self.channel_planes, left_bin, right_bin,
+            self.red_channel_enabled, self.green_channel_enabled, self.blue_channel_enabled
+        )
         
     def get_highlighted_image(self):
-        """Get the image with brightness adjustment overlay"""
+        """Get the image with brightness adjustment overlay, valid until the next highlight_changed"""
         if self.original_image_array is None or not self.highlight_enabled:
             return None
             
-        # Return cached highlighted image if available
+        # Return cached highlighted image if available. It is shared and read-only, and
+        # after the next highlight_changed it may be handed back to the processor and
+        # overwritten, so callers must not keep it past that signal
         if self.highlighted_image is not None:
-            return self.highlighted_image.copy()
+            return self.highlighted_image
             
         # Fallback to real-time calculation if no cache
-        # Get the highlight mask for pixels with values in the highlighted range
-        mask = self.get_highlight_mask()
-        if mask is None:
-            return None
-            
-        # Create a deep copy of the original image for processing
-        # Use numpy's copy with explicit order to ensure complete isolation
-        result = np.array(self.original_image_array, copy=True, dtype=np.uint8, order='C')
-        
-        # Apply brightness adjustment instead of white masking
-        if np.any(mask):
-            # Create a copy of the mask to avoid any potential reference issues
-            mask_copy = mask.copy()
-            
-            # Get the masked pixels
-            masked_pixels = result[mask_copy, :3]  # RGB channels only
-            
-            # Calculate the distance from current value to maximum (255)
-            distance_to_max = 255 - masked_pixels
-            
-            # Apply brightness adjustment: move towards max by brightness_level percentage
-            brightness_adjustment = distance_to_max * self.brightness_level
-            
-            # Add the adjustment to current values, ensuring we don't exceed 255
-            new_values = np.clip(masked_pixels + brightness_adjustment, 0, 255)
-            
-            # Update the result
-            result[mask_copy, :3] = new_values.astype(np.uint8)
+        left_bin, right_bin = self.highlight_bin_range()
+        mask, result, pixel_count = highlight_image(
+            self.original_image_array, self.channel_planes, left_bin, right_bin,
+            self.red_channel_enabled, self.green_channel_enabled, self.blue_channel_enabled,
+            self.brightness_level
+        )
         
+        # The result is a new array, except when nothing can be highlighted, so copy it
+        # only in that case to keep it completely isolated from the original
+        if result is self.original_image_array:
+            return result.copy()
         return result
         
+    def highlighted_image_is_unchanged(self):
+        """Whether the cached highlighted image is one of the source arrays, because nothing was highlighted"""
+        return self.highlighted_image is not None and any(
+            self.highlighted_image is array for array in (self.original_image_array, self.preview_image_array)
+        )
+        
     def update_pixel_counter(self):
         """Update the pixel counter display with the current number of highlighted pixels"""
         if not self.highlight_enabled or self.original_image_array is None:
@@ -875,40 +1457,103 @@ class HistogramWidget(QWidget):
             self.total_pixel_label.setText("Total image pixels: 0")
             return
             
+        # The total is known right away, also while the range count is still underway
+        total_pixels = self.original_image_array.shape[0] * self.original_image_array.shape[1]
+        self.total_pixel_label.setText(f"Total image pixels: {total_pixels:,}")
+            
         # Use cached pixel count if available
+        approximate = False
         if self.highlight_mask is not None:
             pixel_count = self.current_pixel_count
+            
+            # A result from the subsampled drag preview is scaled up to the full image
+            processed_height, processed_width = self.highlighted_image.shape[:2]
+            if (processed_height, processed_width) != self.original_image_array.shape[:2]:
+                pixel_count = round(pixel_count * total_pixels / (processed_height * processed_width))
+                approximate = True
         else:
-            # Fallback to real-time calculation
-            mask = self.get_highlight_mask()
-            if mask is None:
-                self.pixel_counter_label.setText("Pixels in selected range: 0")
-                self.total_pixel_label.setText("Total image pixels: 0")
+            # Fallback to real-time counting, without allocating a full-size mask.
+            # Counts are remembered per range and channel set, so returning to a range is free
+            left_bin, right_bin = self.highlight_bin_range()
+            count_key = (left_bin, right_bin, self.red_channel_enabled, self.green_channel_enabled, self.blue_channel_enabled)
+            pixel_count = self.pixel_count_cache.get(count_key)
+            
+            # With a single channel the count only depends on that channel's values, so
+            # it is two lookups in its running value counts once they have been built
+            channels = channel_range_setup(*count_key)[0]
+            cumulative_counts = self.cumulative_channel_counts.get(channels[0]) if len(channels) == 1 else None
+            if not channels:
+                # No channels enabled, or an empty or inverted range, selects nothing
+                pixel_count = 0
+            elif pixel_count is None and cumulative_counts is not None:
+                pixel_count = cumulative_range_count(cumulative_counts, left_bin, right_bin)
+                self.pixel_count_cache[count_key] = pixel_count
+            elif pixel_count is None:
+                # Anything else scans the image, which is done on the thread pool so the
+                # GUI stays responsive. The labels are filled in when the count arrives
+                self.start_pixel_count_job(count_key)
+                self.pixel_counter_label.setText("Pixels in selected range: ...")
                 return
-            pixel_count = np.sum(mask)
-        
-        # Calculate total pixels in the image
-        total_pixels = self.original_image_array.shape[0] * self.original_image_array.shape[1]
         
         # Calculate percentage
         percentage = (pixel_count / total_pixels) * 100 if total_pixels > 0 else 0
         
-        # Update the labels
-        self.pixel_counter_label.setText(f"Pixels in selected range: {pixel_count:,} ({percentage:.1f}%)")
-        self.total_pixel_label.setText(f"Total image pixels: {total_pixels:,}")
+        # Update the label
+        approximate_mark = "~" if approximate else ""
+        self.pixel_counter_label.setText(f"Pixels in selected range: {approximate_mark}{pixel_count:,} ({percentage:.1f}%)")
+        
+    def start_pixel_count_job(self, count_key):
+        """Count the pixels for count_key on the thread pool, unless that count is already underway"""
+        if self.pixel_count_job is not None:
+            if self.pixel_count_job.count_key == count_key:
+                return
+                
+            # A count that has not started yet is no longer wanted. A job that already
+            # finished has been deleted by the pool while its result is still queued
+            try:
+                QThreadPool.globalInstance().tryTake(self.pixel_count_job)
+            except RuntimeError:
+                pass
+            
+        self.pixel_count_job = PixelCountJob(self.channel_planes, self.image_cache_key, count_key)
+        self.pixel_count_job.signals.pixel_count_ready.connect(self.on_pixel_count_ready)
+        QThreadPool.globalInstance().start(self.pixel_count_job)
+        
+    def on_pixel_count_ready(self, image_cache_key, count_key, pixel_count, cumulative_counts):
+        """Store a count from a PixelCountJob and refresh the counter"""
+        # Ignore results for an image that has since been replaced or cleared
+        if image_cache_key != self.image_cache_key:
+            return
+            
+        # Counts for ranges that were left in the meantime are still kept for later
+        self.pixel_count_cache[count_key] = pixel_count
+        if cumulative_counts is not None:
+            self.cumulative_channel_counts[channel_range_setup(*count_key)[0][0]] = cumulative_counts
+        if self.pixel_count_job is not None and self.pixel_count_job.count_key == count_key:
+            self.pixel_count_job = None
+            
+        self.update_pixel_counter()
         
     def clear_histogram(self):
         """Clear the histogram data"""
-        self.red_histogram = None
-        self.green_histogram = None
-        self.blue_histogram = None
+        self.channel_histograms = None
+        self.log_channel_histograms = None
         self.original_image_array = None
+        self.channel_planes = None
+        self.preview_image_array = None
+        self.preview_channel_planes = None
+        self.pixel_count_cache = {}
+        self.cumulative_channel_counts = {}
+        self.pixel_count_job = None
+        self.image_cache_key = None
+        self.pending_pixmap = None
         
         # Reset brightness to default 80%
         self.brightness_level = 0.8
         self.brightness_slider.setValue(80)
         self.brightness_value_label.setText("80%")
         
+        self.histogram_container.invalidate_bars()
         self.histogram_container.update()
         self.update_pixel_counter()
         
@@ -923,34 +1568,61 @@ class HistogramWidget(QWidget):
         if hasattr(self, 'image_processor') and self.image_processor.isRunning():
             self.image_processor.stop()
         super().hideEvent(event) 
+        
+    def showEvent(self, event):
+        """Restart background processing and handle any image set while hidden"""
+        super().showEvent(event)
+        if not self.image_processor.isRunning():
+            self.image_processor.running = True
+            self.image_processor.start()
+        if self.pending_pixmap is not None:
+            self.set_image(self.pending_pixmap)
 
     def on_image_processing_complete(self, mask, highlighted_array, pixel_count):
         """Handle results from the background image processor"""
+        previous_image = self.highlighted_image
         self.highlight_mask = mask
+        
+        # The result is handed out as is, read-only, instead of as a copy per caller
         self.highlighted_image = highlighted_array
+        self.highlighted_image.setflags(write=False)
         self.current_pixel_count = pixel_count
+        
+        # Nothing drawn in the histogram depends on the processed result, only the
+        # counter label changes, and setting its text already repaints it
         self.update_pixel_counter()
-        self.histogram_container.update()
-        self.update()
         
 
         
         # Emit signal to update the image viewer
         self.highlight_changed.emit()
         
+        # Listeners have switched to the new result by now, so the processor can write
+        # the next result into the previous one. A result that is one of the source
+        # arrays themselves, from a run that highlighted nothing, is never recycled
+        if previous_image is not None and all(
+            previous_image is not array for array in (highlighted_array, self.original_image_array, self.preview_image_array)
+        ):
+            self.image_processor.recycle_result(previous_image)
+        
     def process_highlight_update(self):
         """Process highlight update after debouncing"""
         if not self.highlight_enabled or self.original_image_array is None:
             return
             
+        # While dragging, the subsampled image gives quick approximate feedback.
+        # Releasing the mouse requests the full resolution result
+        preview = self.is_highlighting
+        
         # Create cache key to avoid redundant processing
+        # The results only depend on the whole-bin range, not the exact center and width
         cache_key = (
-            self.highlight_center,
-            self.highlight_width,
+            self.highlight_bin_range(),
             self.red_channel_enabled,
             self.green_channel_enabled,
             self.blue_channel_enabled,
-            self.brightness_level
+            self.brightness_level,
+            preview
         )
         
         # Check if we can use cached results
@@ -963,7 +1635,8 @@ class HistogramWidget(QWidget):
             
         # Request processing from background thread
         params = {
-            'image_array': self.original_image_array,
+            'image_array': self.preview_image_array if preview else self.original_image_array,
+            'channel_planes': self.preview_channel_planes if preview else self.channel_planes,
             'highlight_center': self.highlight_center,
             'highlight_width': self.highlight_width,
             'red_enabled': self.red_channel_enabled,
@@ -15,19 +15,21 @@ class ImageLoader:
             pil_image = Image.open(file_path)
             
             # Convert PIL image to QPixmap
-            if pil_image.mode == "RGBA":
-                # Convert RGBA to RGB if needed
+            if pil_image.mode != "RGB":
+                # Convert RGBA, grayscale, palette etc. to RGB so the array is always H x W x 3
                 pil_image = pil_image.convert("RGB")
             
             # Convert PIL image to numpy array
-            image_array = np.array(pil_image)
+            image_array = np.ascontiguousarray(pil_image)
             
-            # Convert numpy array to QImage
+            # Convert numpy array to QImage, using the array's real row stride
             height, width, channel = image_array.shape
-            bytes_per_line = 3 * width
+            bytes_per_line = image_array.strides[0]
             q_image = QImage(image_array.data, width, height, bytes_per_line, QImage.Format.Format_RGB888)
             
             # Convert QImage to QPixmap
+            # The RGB888 pixels are converted to the pixmap's own format here, so the pixmap
+            # does not reference image_array's buffer once this returns
             pixmap = QPixmap.fromImage(q_image)
             
             return pixmap, None
@@ -1,7 +1,6 @@
 from PyQt6.QtWidgets import QLabel, QVBoxLayout, QWidget, QScrollArea
 from PyQt6.QtGui import QPixmap, QImage
-from PyQt6.QtCore import Qt, pyqtSignal
-import numpy as np
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer
 
 class ImageViewer(QWidget):
     """Widget for displaying images with scroll area and zoom support"""
@@ -16,8 +15,33 @@ class ImageViewer(QWidget):
         # Store current image data
         self.original_pixmap = None
         self.highlighted_image_array = None
+        self.highlighted_qimage = None
         self.current_zoom = 1.0
         
+        # Last scaled copy of the original pixmap and its (cacheKey, width, height, transformation) key
+        self.scaled_original_pixmap = None
+        self.scaled_original_key = None
+        
+        # Last scaled copy of the highlighted image and its (width, height, transformation) key,
+        # dropped whenever a new highlighted image arrives
+        self.scaled_highlight_pixmap = None
+        self.scaled_highlight_key = None
+        
+        # What the label currently shows: the source pixmap or image, the target size
+        # and the transformation it was scaled with
+        self.displayed_source = None
+        self.displayed_size = None
+        self.displayed_transformation = None
+        
+        # Updates that follow each other within the timer interval, like zoom slider drags
+        # or highlight previews, are scaled with the fast transformation. Once the updates
+        # stop, the timer renders the image once more with the smooth transformation
+        self.smooth_render_pending = False
+        self.smooth_render_timer = QTimer()
+        self.smooth_render_timer.setSingleShot(True)
+        self.smooth_render_timer.setInterval(150)
+        self.smooth_render_timer.timeout.connect(self.finish_interactive_updates)
+        
         # Store highlight parameters
         self.highlight_center = 0.5
         self.highlight_width = 0.1
@@ -58,22 +82,13 @@ class ImageViewer(QWidget):
         
     def set_image(self, pixmap):
         """Set the image to display"""
+        # Only the pixmap is kept, the pixels used for processing live in HistogramWidget
         self.original_pixmap = pixmap
         self.highlighted_image_array = None
+        self.highlighted_qimage = None
         self.highlight_enabled = False
-        
-        # Store the original image array for processing
-        if pixmap is not None:
-            image = pixmap.toImage()
-            width = image.width()
-            height = image.height()
-            
-            # Get pixel data
-            ptr = image.bits()
-            ptr.setsize(height * width * 4)  # 4 bytes per pixel (RGBA)
-            self.original_image_array = np.frombuffer(ptr, np.uint8).reshape((height, width, 4))
-        else:
-            self.original_image_array = None
+        self.scaled_highlight_pixmap = None
+        self.scaled_highlight_key = None
         
         self.reset_zoom()
         # Emit signal that image has been modified
@@ -83,6 +98,21 @@ class ImageViewer(QWidget):
     def set_highlighted_image(self, highlighted_array, center=None, width=None, enabled=None):
         """Set the highlighted image array for overlay"""
         self.highlighted_image_array = highlighted_array
+        self.highlighted_qimage = None
+        self.scaled_highlight_pixmap = None
+        self.scaled_highlight_key = None
+        
+        # Wrap the BGRA array once as an RGB32 image over its own buffer, so zoom changes
+        # only rescale it. The array stays alive and unchanged while it is the current one
+        if highlighted_array is not None:
+            height, width = highlighted_array.shape[:2]
+            self.highlighted_qimage = QImage(
+                highlighted_array.data,
+                width,
+                height,
+                highlighted_array.strides[0],  # bytes per line
+                QImage.Format.Format_RGB32
+            )
         
         # Update highlight parameters if provided
         if center is not None:
@@ -97,7 +127,10 @@ class ImageViewer(QWidget):
     def clear_highlight(self):
         """Clear the highlighted image overlay"""
         self.highlighted_image_array = None
+        self.highlighted_qimage = None
         self.highlight_enabled = False
+        self.scaled_highlight_pixmap = None
+        self.scaled_highlight_key = None
         self.update_zoomed_image()
         
     def set_zoom(self, zoom_level):
@@ -164,61 +197,95 @@ class ImageViewer(QWidget):
                 new_width = int(new_width * scale_factor)
             self.current_zoom = new_width / original_size.width()
         
+        # Nothing to redo when the label already shows this source at this size, unless
+        # it was scaled with the fast transformation and no more updates are coming in
+        if self.highlight_enabled and self.highlighted_qimage is not None:
+            source = self.highlighted_qimage
+        else:
+            source = self.original_pixmap
+        interactive = self.smooth_render_timer.isActive()
+        if (source is self.displayed_source and (new_width, new_height) == self.displayed_size
+                and (interactive or self.displayed_transformation == Qt.TransformationMode.SmoothTransformation)):
+            return
+        
+        # Use the fast transformation while updates keep coming in
+        self.smooth_render_timer.start()
+        self.smooth_render_pending = interactive
+        if interactive:
+            transformation = Qt.TransformationMode.FastTransformation
+        else:
+            transformation = Qt.TransformationMode.SmoothTransformation
+        
         # Create the composite image (highlighted or original)
-        composite_pixmap = self.create_composite_image(new_width, new_height)
+        composite_pixmap = self.create_composite_image(new_width, new_height, transformation)
         
         # Update the image label
         self.image_label.setPixmap(composite_pixmap)
+        self.displayed_source = source
+        self.displayed_size = (new_width, new_height)
+        self.displayed_transformation = transformation
         
         # Update container size to accommodate zoomed image
         self.image_container.setMinimumSize(new_width, new_height)
         
-    def create_composite_image(self, target_width, target_height):
+    def finish_interactive_updates(self):
+        """Render the image smoothly once fast interactive updates have stopped"""
+        if self.smooth_render_pending:
+            self.smooth_render_pending = False
+            self.update_zoomed_image()
+            
+    def create_composite_image(self, target_width, target_height, transformation=Qt.TransformationMode.SmoothTransformation):
         """Create a composite image (highlighted or original)"""
         if self.original_pixmap is None:
             return QPixmap()
             
         # If highlighting is enabled and we have a highlighted image, use it directly
-        if self.highlight_enabled and self.highlighted_image_array is not None:
-            # Convert the highlighted image array directly to a pixmap
-            height, width = self.highlighted_image_array.shape[:2]
-            
-            # Ensure the array is contiguous and in the right format
-            rgb_array = self.highlighted_image_array[:, :, :3].copy()
-            rgb_array = np.ascontiguousarray(rgb_array)
-            
-            # Create QImage from the highlighted array (RGB only)
-            q_image = QImage(
-                rgb_array.data, 
-                width, 
-                height, 
-                3 * width,  # bytes per line
-                QImage.Format.Format_RGB888
-            )
+        if self.highlight_enabled and self.highlighted_qimage is not None:
+            # Zoom changes reuse the last conversion when the highlighted image is unchanged
+            scaled_highlight_key = (target_width, target_height, transformation)
+            if scaled_highlight_key == self.scaled_highlight_key:
+                return self.scaled_highlight_pixmap
             
             # Scale the QImage to match target dimensions
-            scaled_q_image = q_image.scaled(
+            scaled_q_image = self.highlighted_qimage.scaled(
                 target_width, 
                 target_height,
                 Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
+                transformation
             )
             
             # Convert to QPixmap and return
-            return QPixmap.fromImage(scaled_q_image)
+            self.scaled_highlight_pixmap = QPixmap.fromImage(scaled_q_image)
+            self.scaled_highlight_key = scaled_highlight_key
+            return self.scaled_highlight_pixmap
         
         # If no highlight, just return the scaled original
-        scaled_original = self.original_pixmap.scaled(
-            target_width, target_height,
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
-        )
+        # The smooth rescale is only redone when the image or target size changed
+        scaled_original_key = (self.original_pixmap.cacheKey(), target_width, target_height, transformation)
+        if scaled_original_key != self.scaled_original_key:
+            self.scaled_original_pixmap = self.original_pixmap.scaled(
+                target_width, target_height,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                transformation
+            )
+            self.scaled_original_key = scaled_original_key
         
-        return scaled_original
+        return self.scaled_original_pixmap
         
     def clear_image(self):
         """Clear the displayed image"""
         self.original_pixmap = None
+        self.scaled_original_pixmap = None
+        self.scaled_original_key = None
+        self.highlighted_image_array = None
+        self.highlighted_qimage = None
+        self.scaled_highlight_pixmap = None
+        self.scaled_highlight_key = None
+        self.displayed_source = None
+        self.displayed_size = None
+        self.displayed_transformation = None
+        self.smooth_render_timer.stop()
+        self.smooth_render_pending = False
         self.image_label.clear()
         self.image_label.setText("No image loaded\nClick 'Load Image' to select a file")
         self.image_container.setMinimumSize(400, 300)
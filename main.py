@@ -127,20 +127,23 @@ class HistoEditMainWindow(QMainWindow):
     def update_highlight_overlay(self):
         """Update the highlight overlay when histogram highlight changes"""
         # Get the highlighted image from the histogram widget
+        # It is shared read-only and replaced on every change, which the viewer follows
         highlighted_array = self.control_panel.histogram_widget.get_highlighted_image()
         
         if highlighted_array is not None:
-            # Create a completely independent copy to prevent corruption
-            highlighted_array_copy = highlighted_array.copy()
-            
             # Get highlight parameters from histogram widget
             histogram_widget = self.control_panel.histogram_widget
             center = histogram_widget.highlight_center
             width = histogram_widget.highlight_width
             enabled = histogram_widget.highlight_enabled
             
+            # With nothing highlighted the array holds the unmodified pixels, so the viewer
+            # can keep showing its scaled original instead of converting the array
+            if histogram_widget.highlighted_image_is_unchanged():
+                highlighted_array = None
+            
             # Set the highlighted image in the viewer with parameters
-            self.image_viewer.set_highlighted_image(highlighted_array_copy, center, width, enabled)
+            self.image_viewer.set_highlighted_image(highlighted_array, center, width, enabled)
         else:
             # Clear the highlight if none is available
             self.image_viewer.clear_highlight()
@@ -0,0 +1,143 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+
+import histogram_widget
+from histogram_widget import (HistogramWidget, ImageProcessorThread, channel_range_count, channel_range_mask,
+                              channel_range_packed_mask, cumulative_range_count, cumulative_value_counts,
+                              highlight_image, split_channel_planes)
+
+
+def reference_mask(image_array, left_bin, right_bin):
+    """The plain two-comparison range test over the B, G, R bytes of a BGRA array"""
+    values = image_array[:, :, :3]
+    return ((values >= left_bin) & (values <= right_bin)).any(axis=2)
+
+
+def reference_highlight(image_array, left_bin, right_bin, brightness_level):
+    """Brighten the selected pixels with the original floating point formula"""
+    mask = reference_mask(image_array, left_bin, right_bin)
+    result = image_array.copy()
+    masked_pixels = result[mask, :3]
+    new_values = np.clip(masked_pixels + (255 - masked_pixels) * brightness_level, 0, 255)
+    result[mask, :3] = new_values.astype(np.uint8)
+    return result
+
+
+class ChannelRangeTest(unittest.TestCase):
+    """Check the range kernels against the plain range test, including degenerate ranges"""
+
+    def setUp(self):
+        # Every value from 0 to 255 occurs in every channel
+        rng = np.random.default_rng(0)
+        self.image_array = rng.integers(0, 256, size=(300, 37, 4), dtype=np.uint8)
+        self.image_array[0, :32, :3] = np.arange(256, dtype=np.uint8).reshape(32, 8)[:, :3]
+        self.image_array[1, :32, :3] = np.arange(256, dtype=np.uint8).reshape(32, 8)[:, 5:]
+        self.channel_planes = split_channel_planes(self.image_array)
+
+    def assert_selects(self, left_bin, right_bin, expected_mask):
+        """Check every range kernel selects expected_mask for [left_bin, right_bin]"""
+        mask = channel_range_mask(self.channel_planes, left_bin, right_bin, True, True, True)
+        np.testing.assert_array_equal(mask, expected_mask)
+
+        count = channel_range_count(self.channel_planes, left_bin, right_bin, True, True, True)
+        self.assertEqual(count, int(expected_mask.sum()))
+
+        packed_mask, packed_count = channel_range_packed_mask(self.channel_planes, left_bin, right_bin, True, True, True)
+        self.assertEqual(packed_count, int(expected_mask.sum()))
+        np.testing.assert_array_equal(np.unpackbits(packed_mask, axis=1, count=mask.shape[1]).view(bool), expected_mask)
+
+    def test_matches_reference(self):
+        for left_bin, right_bin in ((0, 255), (0, 0), (255, 255), (13, 37), (-20, 10), (250, 300)):
+            self.assert_selects(left_bin, right_bin, reference_mask(self.image_array, left_bin, right_bin))
+
+    def test_inverted_range_selects_nothing(self):
+        nothing = np.zeros(self.image_array.shape[:2], dtype=bool)
+        for left_bin, right_bin in ((130, 120), (101, 100), (260, 250), (300, 299)):
+            self.assert_selects(left_bin, right_bin, nothing)
+
+        # The image is handed back unmodified, as for any empty selection
+        mask, result, pixel_count = highlight_image(self.image_array, self.channel_planes, 130, 120, True, True, True, 0.8)
+        self.assertIs(result, self.image_array)
+        self.assertEqual(pixel_count, 0)
+
+    def test_highlight_past_the_right_edge(self):
+        # Dragging past the right edge puts the center on bin 256, and dragging below
+        # the histogram at the same time makes the width negative
+        for highlight_width in (10 / 255, -10 / 255):
+            highlight = SimpleNamespace(highlight_center=1.004, highlight_width=highlight_width)
+            left_bin, right_bin = HistogramWidget.highlight_bin_range(highlight)
+            self.assertEqual(int(highlight.highlight_center * 255), 256)
+            self.assert_selects(left_bin, right_bin, reference_mask(self.image_array, left_bin, right_bin))
+
+    def test_cumulative_range_count(self):
+        totals = cumulative_value_counts(self.channel_planes[2])
+        red = self.image_array[:, :, 2]
+        for left_bin, right_bin in ((0, 255), (13, 37), (-20, 10), (250, 300)):
+            self.assertEqual(cumulative_range_count(totals, left_bin, right_bin),
+                             int(((red >= left_bin) & (red <= right_bin)).sum()))
+        for left_bin, right_bin in ((130, 120), (260, 250), (300, 299)):
+            self.assertEqual(cumulative_range_count(totals, left_bin, right_bin), 0)
+
+
+class HighlightImageTest(unittest.TestCase):
+    """Check the brightened image against the original floating point formula"""
+
+    def setUp(self):
+        # Three bands of rows: the first mostly dark, the others spread over all values,
+        # so a range can select most pixels of one band and few of another
+        rng = np.random.default_rng(1)
+        self.image_array = rng.integers(0, 256, size=(300, 53, 4), dtype=np.uint8)
+        self.image_array[:128, :, :3] = rng.integers(0, 60, size=(128, 53, 3), dtype=np.uint8)
+        self.channel_planes = split_channel_planes(self.image_array)
+
+    def check_highlight(self, left_bin, right_bin, brightness_level, out=None):
+        mask, result, pixel_count = highlight_image(
+            self.image_array, self.channel_planes, left_bin, right_bin, True, True, True, brightness_level, out
+        )
+        expected = reference_highlight(self.image_array, left_bin, right_bin, brightness_level)
+        np.testing.assert_array_equal(result, expected)
+        self.assertEqual(pixel_count, int(reference_mask(self.image_array, left_bin, right_bin).sum()))
+        return result
+
+    def test_sparse_and_dense_masks(self):
+        # (100, 104) selects few pixels everywhere, (0, 70) most of the dark band and
+        # (0, 250) most of every band
+        for left_bin, right_bin in ((100, 104), (0, 70), (0, 250)):
+            for brightness_level in (0.0, 0.33, 0.8, 1.0):
+                self.check_highlight(left_bin, right_bin, brightness_level)
+
+    def test_sparse_path_without_pair_tables(self):
+        with mock.patch.object(histogram_widget, 'LITTLE_ENDIAN', False):
+            for left_bin, right_bin in ((100, 104), (0, 250)):
+                self.check_highlight(left_bin, right_bin, 0.8)
+
+    def test_reused_out_buffer(self):
+        out = np.full_like(self.image_array, 7)
+        result = self.check_highlight(0, 70, 0.8, out=out)
+        self.assertIs(result, out)
+        result = self.check_highlight(100, 104, 0.33, out=out)
+        self.assertIs(result, out)
+
+    def test_recycled_result(self):
+        processor = ImageProcessorThread()
+        params = dict(
+            image_array=self.image_array, channel_planes=self.channel_planes,
+            highlight_center=35 / 255, highlight_width=70 / 255,
+            red_enabled=True, green_enabled=True, blue_enabled=True, brightness_level=0.8
+        )
+        first = processor.process_image(params)[1]
+        np.testing.assert_array_equal(first, reference_highlight(self.image_array, 0, 70, 0.8))
+
+        # Handed back read-only, like HistogramWidget does, then overwritten by the next run
+        first.setflags(write=False)
+        processor.recycle_result(first)
+        second = processor.process_image(dict(params, highlight_center=102 / 255, brightness_level=0.33))[1]
+        self.assertIs(second, first)
+        np.testing.assert_array_equal(second, reference_highlight(self.image_array, 67, 137, 0.33))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import unittest
+from unittest import mock
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+from PyQt6.QtCore import QThreadPool
+from PyQt6.QtGui import QImage, QPixmap
+from PyQt6.QtWidgets import QApplication
+
+from histogram_widget import HistogramWidget, highlight_image
+
+app = QApplication.instance() or QApplication([])
+
+
+class HistogramWidgetTest(unittest.TestCase):
+    """Check HistogramWidget's background counting against the plain range test"""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.image_array = rng.integers(0, 256, size=(64, 48, 4), dtype=np.uint8)
+        image = QImage(self.image_array.data, 48, 64, 48 * 4, QImage.Format.Format_RGB32).copy()
+
+        self.widget = HistogramWidget()
+        self.widget.show()
+        self.widget.set_image(QPixmap.fromImage(image))
+        self.wait_for_pool()
+
+    def tearDown(self):
+        self.wait_for_pool()
+        self.widget.image_processor.stop()
+        self.widget.close()
+
+    def wait_for_pool(self):
+        """Let the thread pool finish and deliver its queued results"""
+        QThreadPool.globalInstance().waitForDone()
+        app.processEvents()
+
+    def reference_count(self, left_bin, right_bin):
+        values = self.image_array[:, :, :3]
+        return int(((values >= left_bin) & (values <= right_bin)).any(axis=2).sum())
+
+    def test_new_count_after_finished_undelivered_job(self):
+        # The first job finishes and is deleted by the pool before its result is
+        # delivered, then the range changes and a second job replaces it
+        first_key = (10, 50, True, True, True)
+        second_key = (20, 60, True, True, True)
+        self.widget.start_pixel_count_job(first_key)
+        QThreadPool.globalInstance().waitForDone()
+        self.widget.start_pixel_count_job(second_key)
+        self.wait_for_pool()
+
+        self.assertEqual(self.widget.pixel_count_cache[first_key], self.reference_count(10, 50))
+        self.assertEqual(self.widget.pixel_count_cache[second_key], self.reference_count(20, 60))
+        self.assertIsNone(self.widget.pixel_count_job)
+
+    def test_total_shown_while_count_is_underway(self):
+        self.widget.highlight_enabled = True
+        self.widget.highlight_mask = None
+        self.widget.total_pixel_label.setText("Total image pixels: 1")
+        self.widget.pixel_count_cache = {}
+        self.widget.update_pixel_counter()
+
+        self.assertEqual(self.widget.pixel_counter_label.text(), "Pixels in selected range: ...")
+        self.assertEqual(self.widget.total_pixel_label.text(), "Total image pixels: 3,072")
+
+    def test_empty_range_counts_without_a_job(self):
+        self.wait_for_pool()
+        self.widget.highlight_enabled = True
+        self.widget.highlight_mask = None
+        self.widget.highlight_center = 0.5
+        self.widget.highlight_width = -0.08
+        self.widget.update_pixel_counter()
+
+        self.assertIsNone(self.widget.pixel_count_job)
+        self.assertEqual(self.widget.pixel_counter_label.text(), "Pixels in selected range: 0 (0.0%)")
+
+    def test_highlight_mask_is_full_resolution_during_preview(self):
+        # Reload with a tiny preview size, so the drag preview is subsampled
+        with mock.patch('histogram_widget.PREVIEW_PIXELS', 256):
+            pixmap = QPixmap.fromImage(QImage(self.image_array.data, 48, 64, 48 * 4, QImage.Format.Format_RGB32).copy())
+            self.widget.image_cache_key = None
+            self.widget.set_image(pixmap)
+        self.wait_for_pool()
+        self.assertLess(self.widget.preview_image_array.shape[0], 64)
+
+        # A processed preview result for the bin range [10, 50]
+        self.widget.highlight_enabled = True
+        self.widget.highlight_center = 30.5 / 255
+        self.widget.highlight_width = 40.5 / 255
+        self.assertEqual(self.widget.highlight_bin_range(), (10, 50))
+        self.widget.on_image_processing_complete(*highlight_image(
+            self.widget.preview_image_array, self.widget.preview_channel_planes, 10, 50, True, True, True, 0.8
+        ))
+
+        values = self.image_array[:, :, :3]
+        np.testing.assert_array_equal(self.widget.get_highlight_mask(), ((values >= 10) & (values <= 50)).any(axis=2))
+
+
+if __name__ == '__main__':
+    unittest.main()